@@ -1,32 +1,62 @@
 # app.py
 import streamlit as st
-from src.data_loader import load_core, build_enriched_results
-from src.analytics import driver_points, constructor_points, championship_counts, driver_race_results, sprint_results_for_driver
-from src.preprocessing import get_drivers_for_year
+from src.data_loader import DATA_DIR_DEFAULT, cached_load_core, build_enriched_results
+from src.analytics import (
+    driver_points, constructor_points, season_champions, championship_counts,
+    driver_race_results, sprint_results_for_driver
+)
+from src.preprocessing import get_drivers_for_year, split_by_year
 from src.visualizer import (
-    plot_top_driver_points, plot_constructor_points, plot_championship_pie,
-    plot_driver_season_progress, show_results_table
+    plot_championship_pie, plot_driver_season_progress, show_points_chart, show_results_table
 )
 import pandas as pd
 
 st.set_page_config(page_title="F1 Data Visualizer", layout="wide")
 st.title("F1 Data Visualizer")
 
-# Load data
-data = load_core()
-drivers = data["drivers"]
-races = data["races"]
-results = data["results"]
-constructors = data["constructors"]
-sprint = data.get("sprint_results")
+@st.cache_data(show_spinner=False)
+def _load_enriched(data_dir: str = DATA_DIR_DEFAULT):
+    # Parsed CSVs come from the process-wide resource cache; only the merge runs per cache miss.
+    data = cached_load_core(data_dir)
+    enriched = build_enriched_results(data["drivers"], data["races"], data["results"], data["constructors"])
+    return enriched, data.get("sprint_results")
 
-# Build enriched results
+# Load data & build enriched results
 try:
-    enriched = build_enriched_results(drivers, races, results, constructors)
+    enriched, sprint = _load_enriched()
 except Exception as e:
     st.error(f"Data loading error: {e}")
     st.stop()
 
+# Cached analytics. The leading underscore keeps Streamlit from hashing the
+# enriched frame; the data dir acts as the version key, so entries are keyed on year.
+@st.cache_resource(show_spinner=False)
+def _results_by_year(_enriched, data_key: str):
+    # shared read-only partitions, not copied per rerun
+    return split_by_year(_enriched)
+
+@st.cache_data(show_spinner=False)
+def _driver_points(_enriched, data_key: str, year: int | None = None):
+    df = _enriched if year is None else _results_by_year(_enriched, data_key)[year]
+    return driver_points(df)
+
+@st.cache_data(show_spinner=False)
+def _constructor_points(_enriched, data_key: str, year: int | None = None):
+    df = _enriched if year is None else _results_by_year(_enriched, data_key)[year]
+    return constructor_points(df)
+
+@st.cache_data(show_spinner=False)
+def _drivers_for_year(_enriched, data_key: str, year: int):
+    return get_drivers_for_year(_enriched, year)
+
+@st.cache_data(show_spinner=False)
+def _season_champions(_enriched, data_key: str):
+    return season_champions(_enriched)
+
+@st.cache_data(show_spinner=False)
+def _championship_counts(_enriched, data_key: str):
+    return championship_counts(_enriched, champs=_season_champions(_enriched, data_key))
+
 # Sidebar controls
 years = sorted([int(y) for y in enriched["year"].dropna().unique().tolist()]) if "year" in enriched.columns else []
 year_choice = st.sidebar.selectbox("Select Year", ["All Time"] + years)
@@ -40,45 +70,49 @@ tab_overview, tab_drivers, tab_constructors, tab_champs = st.tabs(["Overview", "
 with tab_overview:
     st.header("Overview")
     if year_choice == "All Time":
-        pts = driver_points(enriched, year=None)
-        fig = plot_top_driver_points(pts, top_n=top_n)
-        st.pyplot(fig, clear_figure=True)
+        pts = _driver_points(enriched, DATA_DIR_DEFAULT, year=None)
+        show_points_chart(pts, "driverName", top_n=top_n, title="Top Drivers by Points")
 
-        cons = constructor_points(enriched, year=None)
-        figc = plot_constructor_points(cons, top_n=top_n)
-        st.pyplot(figc, clear_figure=True)
+        cons = _constructor_points(enriched, DATA_DIR_DEFAULT, year=None)
+        show_points_chart(cons, "constructorName", top_n=top_n, title="Top Constructors by Points")
     else:
         year = int(year_choice)
-        pts = driver_points(enriched, year=year)
-        fig = plot_top_driver_points(pts, top_n=top_n)
-        st.pyplot(fig, clear_figure=True)
+        pts = _driver_points(enriched, DATA_DIR_DEFAULT, year=year)
+        show_points_chart(pts, "driverName", top_n=top_n, title="Top Drivers by Points")
 
-        cons = constructor_points(enriched, year=year)
-        figc = plot_constructor_points(cons, top_n=top_n)
-        st.pyplot(figc, clear_figure=True)
+        cons = _constructor_points(enriched, DATA_DIR_DEFAULT, year=year)
+        show_points_chart(cons, "constructorName", top_n=top_n, title="Top Constructors by Points")
 
 # Drivers tab
 with tab_drivers:
     st.header("Drivers")
     if year_choice == "All Time":
-        pts_all = driver_points(enriched, year=None)
+        pts_all = _driver_points(enriched, DATA_DIR_DEFAULT, year=None)
         driver_options = pts_all["driverName"].tolist()
+        name_to_row = dict(zip(driver_options, zip(pts_all["driverId"], pts_all["points"])))
         selected_driver_name = st.selectbox("Select Driver (All Time)", ["None"] + driver_options)
         if selected_driver_name != "None":
-            driver_row = pts_all[pts_all["driverName"] == selected_driver_name].iloc[0]
-            driver_id = driver_row["driverId"]
+            driver_id, career_points = name_to_row[selected_driver_name]
             # show aggregated career points and championships
-            st.subheader(f"{selected_driver_name} — Career Points: {int(driver_row['points'])}")
+            st.subheader(f"{selected_driver_name} — Career Points: {int(career_points)}")
             # show per-season table
-            per_season = enriched[enriched["driverId"] == driver_id].groupby("year")["points"].sum().reset_index()
+            # points are stored as float32; widen and round like the other point totals
+            per_season = (
+                driver_race_results(enriched, driver_id).groupby("year")["points"]
+                  .sum()
+                  .astype("float64")
+                  .round(2)
+                  .reset_index()
+            )
             st.dataframe(per_season)
     else:
         year = int(year_choice)
-        drivers_in_year = get_drivers_for_year(enriched, year)
+        drivers_in_year = _drivers_for_year(enriched, DATA_DIR_DEFAULT, year)
         driver_map = drivers_in_year["driverName"].tolist()
+        name_to_id = dict(zip(driver_map, drivers_in_year["driverId"]))
         selected_driver_name = st.selectbox("Select Driver", ["None"] + driver_map)
         if selected_driver_name != "None":
-            driver_id = drivers_in_year[drivers_in_year["driverName"] == selected_driver_name].iloc[0]["driverId"]
+            driver_id = name_to_id[selected_driver_name]
             st.subheader(f"{selected_driver_name} — {year} Season Results")
             # race by race results
             dr_results = driver_race_results(enriched, driver_id, year=year)
@@ -99,15 +133,13 @@ with tab_drivers:
 with tab_constructors:
     st.header("Constructors / Teams")
     if year_choice == "All Time":
-        cons = constructor_points(enriched, year=None)
-        figc = plot_constructor_points(cons, top_n=top_n)
-        st.pyplot(figc, clear_figure=True)
+        cons = _constructor_points(enriched, DATA_DIR_DEFAULT, year=None)
+        show_points_chart(cons, "constructorName", top_n=top_n, title="Top Constructors by Points")
         st.dataframe(cons.head(top_n))
     else:
         year = int(year_choice)
-        cons = constructor_points(enriched, year=year)
-        figc = plot_constructor_points(cons, top_n=top_n)
-        st.pyplot(figc, clear_figure=True)
+        cons = _constructor_points(enriched, DATA_DIR_DEFAULT, year=year)
+        show_points_chart(cons, "constructorName", top_n=top_n, title="Top Constructors by Points")
         st.dataframe(cons)
 
 # Championships tab
@@ -116,14 +148,13 @@ with tab_champs:
     # season champions table
     season_champs = None
     try:
-        from src.analytics import season_champions, championship_counts
-        season_champs = season_champions(enriched)
+        season_champs = _season_champions(enriched, DATA_DIR_DEFAULT)
         st.subheader("Season Champions")
         st.dataframe(season_champs)
     except Exception:
         st.write("Season champions not available.")
     # championship counts & pie
-    counts = championship_counts(enriched)
+    counts = _championship_counts(enriched, DATA_DIR_DEFAULT)
     figpie = plot_championship_pie(counts, top_n=10)
     st.pyplot(figpie, clear_figure=True)
     st.dataframe(counts)
@@ -1,49 +1,58 @@
 # src/analytics.py
+import numpy as np
 import pandas as pd
+from src.data_loader import DRIVER_INDEX
 
-def driver_points(enriched_results: pd.DataFrame, year: int | None = None):
-    df = enriched_results.copy()
-    if year is not None:
-        df = df[df["year"] == int(year)]
+def _points_by(df: pd.DataFrame, id_col: str, name_col: str):
+    # group-sum over factorized integer codes instead of a two-key (id, name) groupby;
+    # points have at most two decimals, so rounding drops float32 accumulation noise
+    codes, uniques = pd.factorize(df[id_col], use_na_sentinel=False)
+    sums = df["points"].groupby(codes).sum().to_numpy(dtype="float64").round(2)
+    first = np.unique(codes, return_index=True)[1]
     pts = (
-        df.groupby(["driverId", "driverName"], dropna=False)["points"]
-          .sum()
-          .reset_index()
+        pd.DataFrame({id_col: uniques, name_col: df[name_col].array[first], "points": sums})
           .sort_values("points", ascending=False)
           .reset_index(drop=True)
     )
     return pts
 
+def driver_points(enriched_results: pd.DataFrame, year: int | None = None):
+    df = enriched_results
+    if year is not None:
+        df = df[df["year"] == int(year)]
+    return _points_by(df, "driverId", "driverName")
+
 def constructor_points(enriched_results: pd.DataFrame, year: int | None = None):
     if "constructorId" not in enriched_results.columns:
         return pd.DataFrame(columns=["constructorId", "constructorName", "points"])
-    df = enriched_results.copy()
+    df = enriched_results
     if year is not None:
         df = df[df["year"] == int(year)]
-    pts = (
-        df.groupby(["constructorId", "constructorName"], dropna=False)["points"]
-          .sum()
-          .reset_index()
-          .sort_values("points", ascending=False)
-          .reset_index(drop=True)
-    )
-    return pts
+    return _points_by(df, "constructorId", "constructorName")
 
 def season_champions(enriched_results: pd.DataFrame):
-    df = enriched_results.copy()
     season_pts = (
-        df.groupby(["year", "driverId", "driverName"], dropna=False)["points"]
+        enriched_results.groupby(["year", "driverId", "driverName"], dropna=False, observed=True)["points"]
           .sum()
+          .astype("float64")
+          .round(2)
           .reset_index()
     )
-    idx = season_pts.groupby("year")["points"].idxmax()
-    champs = season_pts.loc[idx].sort_values("year").reset_index(drop=True)
+    # highest scorer per year; the stable sort keeps idxmax's tie-break (first driverId)
+    champs = (
+        season_pts.dropna(subset=["year"])
+                  .sort_values(["year", "points"], ascending=[True, False], kind="stable")
+                  .drop_duplicates("year", keep="first")
+                  .reset_index(drop=True)
+    )
     return champs
 
-def championship_counts(enriched_results: pd.DataFrame):
-    champs = season_champions(enriched_results)
+def championship_counts(enriched_results: pd.DataFrame, champs: pd.DataFrame | None = None):
+    # reuse an already computed season_champions frame when the caller has one
+    if champs is None:
+        champs = season_champions(enriched_results)
     counts = (
-        champs.groupby(["driverId", "driverName"]).size()
+        champs.groupby(["driverId", "driverName"], observed=True).size()
               .reset_index(name="championships")
               .sort_values(["championships", "driverName"], ascending=[False, True])
               .reset_index(drop=True)
@@ -51,8 +60,10 @@ def championship_counts(enriched_results: pd.DataFrame):
     return counts
 
 def driver_race_results(enriched_results: pd.DataFrame, driver_id: int | str, year: int | None = None):
-    df = enriched_results.copy()
-    df = df[df["driverId"] == driver_id]
+    if enriched_results.index.name == DRIVER_INDEX:
+        df = enriched_results.loc[driver_id:driver_id]
+    else:
+        df = enriched_results[enriched_results["driverId"] == driver_id]
     if year is not None:
         df = df[df["year"] == int(year)]
     # Select useful columns if exist
@@ -66,8 +77,7 @@ def driver_race_results(enriched_results: pd.DataFrame, driver_id: int | str, ye
 def sprint_results_for_driver(sprint_df: pd.DataFrame, driver_id: int | str, year: int | None = None):
     if sprint_df is None:
         return pd.DataFrame()  # empty
-    df = sprint_df.copy()
-    if year is not None and "year" in df.columns:
-        df = df[df["year"] == int(year)]
-    df = df[df["driverId"] == driver_id]
-    return df.reset_index(drop=True)
+    mask = sprint_df["driverId"] == driver_id
+    if year is not None and "year" in sprint_df.columns:
+        mask &= sprint_df["year"] == int(year)
+    return sprint_df[mask].reset_index(drop=True)
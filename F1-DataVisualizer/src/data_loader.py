@@ -1,32 +1,64 @@
 # src/data_loader.py
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
+try:
+    import pyarrow  # noqa: F401  (optional: multi-threaded CSV parser + Arrow-backed columns)
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+try:
+    import streamlit as st  # optional: only the Streamlit app needs the process-wide cache
+except ImportError:
+    st = None
+
 DATA_DIR_DEFAULT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+DRIVER_INDEX = "driverKey"
 
-def _read_csv_safe(path):
+def _read_csv_safe(path, usecols=None):
     if not os.path.exists(path):
         return None
-    return pd.read_csv(path)
+    if usecols is not None:
+        # keep only wanted columns that exist; optional ones (e.g. "name", "season") may be absent
+        header = pd.read_csv(path, nrows=0).columns
+        usecols = [c for c in header if c in set(usecols)]
+    if _HAS_PYARROW:
+        return pd.read_csv(path, usecols=usecols, engine="pyarrow", dtype_backend="pyarrow")
+    return pd.read_csv(path, usecols=usecols)
 
 def load_core(data_dir: str = DATA_DIR_DEFAULT):
     """
     Load core CSVs. Returns a dict with keys:
     drivers, races, results, constructors, sprint_results (optional)
     """
-    drivers = _read_csv_safe(os.path.join(data_dir, "drivers.csv"))
-    races = _read_csv_safe(os.path.join(data_dir, "races.csv"))
-    results = _read_csv_safe(os.path.join(data_dir, "results.csv"))
-    constructors = _read_csv_safe(os.path.join(data_dir, "constructors.csv"))
-    sprint_results = _read_csv_safe(os.path.join(data_dir, "sprint_results.csv"))  # optional
-
-    return {
-        "drivers": drivers,
-        "races": races,
-        "results": results,
-        "constructors": constructors,
-        "sprint_results": sprint_results
+    # file name + columns to parse (None = all); sprint_results is optional
+    files = {
+        "drivers": ("drivers.csv", ["driverId", "forename", "surname", "name"]),
+        "races": ("races.csv", ["raceId", "year", "season"]),
+        "results": ("results.csv", ["driverId", "raceId", "constructorId", "points", "position", "grid", "status", "round"]),
+        "constructors": ("constructors.csv", ["constructorId", "name"]),
+        "sprint_results": ("sprint_results.csv", None),
     }
+    # the CSV parsers release the GIL, so the independent reads overlap in threads
+    with ThreadPoolExecutor(max_workers=len(files)) as ex:
+        futs = {
+            key: ex.submit(_read_csv_safe, os.path.join(data_dir, name), usecols=cols)
+            for key, (name, cols) in files.items()
+        }
+        return {key: fut.result() for key, fut in futs.items()}
+
+def cached_load_core(data_dir: str = DATA_DIR_DEFAULT):
+    """
+    load_core shared across all Streamlit sessions (st.cache_resource) when
+    streamlit is installed; a plain load_core call otherwise.
+    The returned frames are shared, so callers must not mutate them.
+    """
+    return load_core(data_dir)
+
+if st is not None:
+    cached_load_core = st.cache_resource(show_spinner=False)(cached_load_core)
 
 def build_enriched_results(drivers, races, results, constructors=None):
     """
@@ -41,23 +73,23 @@ def build_enriched_results(drivers, races, results, constructors=None):
     if drivers is not None:
         if {"forename", "surname"}.issubset(drivers.columns):
             drivers = drivers.copy()
-            drivers["driverName"] = (drivers["forename"].astype(str) + " " + drivers["surname"].astype(str)).str.strip()
+            drivers["driverName"] = drivers["forename"].astype(str).str.cat(drivers["surname"].astype(str), sep=" ").str.strip()
         elif "name" in drivers.columns:
             drivers = drivers.copy()
             drivers["driverName"] = drivers["name"].astype(str)
         else:
             drivers = drivers.copy()
             drivers["driverName"] = drivers["driverId"].astype(str)
-        df = df.merge(drivers[["driverId", "driverName"]].drop_duplicates(), on="driverId", how="left")
+        df = df.merge(drivers[["driverId", "driverName"]], on="driverId", how="left", validate="m:1")
     else:
         df["driverName"] = df["driverId"].astype(str)
 
     # constructor name
     if constructors is not None and "constructorId" in df.columns:
         if "name" in constructors.columns:
-            df = df.merge(constructors[["constructorId", "name"]].rename(columns={"name": "constructorName"}), on="constructorId", how="left")
+            df = df.merge(constructors[["constructorId", "name"]].rename(columns={"name": "constructorName"}), on="constructorId", how="left", validate="m:1")
         else:
-            df = df.merge(constructors[["constructorId"]], on="constructorId", how="left")
+            df = df.merge(constructors[["constructorId"]], on="constructorId", how="left", validate="m:1")
             df["constructorName"] = df["constructorId"].astype(str)
     else:
         if "constructorId" in df.columns:
@@ -69,9 +101,28 @@ def build_enriched_results(drivers, races, results, constructors=None):
         year_col = "year" if "year" in races.columns else ("season" if "season" in races.columns else None)
         if year_col is None:
             raise KeyError("races.csv must contain 'year' or 'season' column.")
-        df = df.merge(races[["raceId", year_col]].rename(columns={year_col: "year"}), on="raceId", how="left")
+        df = df.merge(races[["raceId", year_col]].rename(columns={year_col: "year"}), on="raceId", how="left", validate="m:1")
     else:
         # no races.csv -> create empty year
         df["year"] = None
 
+    # compact dtypes: small integer keys and categorical names keep groupbys cheap
+    for c in ("driverId", "constructorId", "raceId", "year"):
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], downcast="integer")
+    for c in ("driverName", "constructorName"):
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    # points fit float32; finishing/grid positions fit Int16 ("\N" placeholders become <NA>)
+    if "points" in df.columns:
+        df["points"] = pd.to_numeric(df["points"], errors="coerce").astype("float32")
+    for c in ("position", "grid"):
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype("Int16")
+
+    # sorted driverId index (kept alongside the column) makes per-driver lookups a slice
+    if "driverId" in df.columns:
+        df = df.sort_values([c for c in ("driverId", "year") if c in df.columns], kind="stable")
+        df.index = pd.Index(df["driverId"].to_numpy(), name=DRIVER_INDEX)
+
     return df
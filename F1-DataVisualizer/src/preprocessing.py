@@ -2,11 +2,19 @@
 import pandas as pd
 
 def get_drivers_for_year(enriched_results: pd.DataFrame, year: int):
-    df = enriched_results.copy()
-    df = df[df["year"] == int(year)]
-    out = df[["driverId", "driverName"]].drop_duplicates().reset_index(drop=True)
+    df = enriched_results[enriched_results["year"] == int(year)]
+    # alphabetical, so the list doesn't depend on the enriched frame's (driverId-sorted) row order
+    out = (
+        df[["driverId", "driverName"]].drop_duplicates()
+          .sort_values("driverName", kind="stable")
+          .reset_index(drop=True)
+    )
     return out
 
+def split_by_year(enriched_results: pd.DataFrame):
+    # one pass over the frame; per-year lookups afterwards are dict hits instead of boolean scans
+    return {int(y): g for y, g in enriched_results.groupby("year", sort=False)}
+
 def safe_int(i):
     try:
         return int(i)
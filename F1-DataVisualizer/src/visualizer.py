@@ -1,43 +1,50 @@
 # src/visualizer.py
+import altair as alt
 import matplotlib.pyplot as plt
-from textwrap import shorten
+import numpy as np
 import streamlit as st
 import pandas as pd
 
 def _auto_height(n: int, base: float = 0.45, min_h: float = 4.0, max_h: float = 20.0) -> float:
     return max(min_h, min(max_h, base * max(5, n)))
 
-def plot_top_driver_points(points_df: pd.DataFrame, top_n: int = 15):
-    data = points_df.head(top_n).copy()
-    if "driverName" not in data.columns and "driverId" in data.columns:
-        data["driverName"] = data["driverId"].astype(str)
-    data["label"] = data["driverName"].apply(lambda s: shorten(str(s), width=28, placeholder="…"))
-    h = _auto_height(len(data))
+def _short_labels(names: pd.Series, width: int = 28) -> pd.Series:
+    s = names.astype(str)
+    return s.where(s.str.len() <= width, s.str.slice(0, width - 1) + "…")
+
+# Figures are cached on plain tuples of labels/values so reruns with unchanged
+# inputs skip the matplotlib layout pass; cache_data hands back a fresh copy each time.
+# Only inside a running Streamlit app: the CLI (main.py) renders each figure once anyway.
+def _cache_figure(func):
+    if st.runtime.exists():
+        return st.cache_data(show_spinner=False, max_entries=64)(func)
+    return func
+
+@_cache_figure
+def _render_barh(labels: tuple, values: tuple, title: str):
+    h = _auto_height(len(labels))
     fig, ax = plt.subplots(figsize=(10, h))
-    ax.barh(data["label"], data["points"])
+    bars = ax.barh(labels, values)
     ax.invert_yaxis()
     ax.set_xlabel("Points")
-    ax.set_title(f"Top {min(top_n, len(points_df))} Drivers by Points")
-    for i, v in enumerate(data["points"]):
-        ax.text(v, i, f" {int(v)}", va='center', fontsize=8)
+    ax.set_title(title)
+    ax.bar_label(bars, labels=[f"{int(v)}" for v in values], padding=2, fontsize=8)
     fig.tight_layout()
     return fig
 
+def plot_top_driver_points(points_df: pd.DataFrame, top_n: int = 15):
+    data = points_df.head(top_n).copy()
+    if "driverName" not in data.columns and "driverId" in data.columns:
+        data["driverName"] = data["driverId"].astype(str)
+    data["label"] = _short_labels(data["driverName"])
+    return _render_barh(tuple(data["label"]), tuple(data["points"].tolist()), f"Top {min(top_n, len(points_df))} Drivers by Points")
+
 def plot_constructor_points(constructors_df: pd.DataFrame, top_n: int = 15):
     if "constructorName" not in constructors_df.columns and "constructorId" in constructors_df.columns:
         constructors_df["constructorName"] = constructors_df["constructorId"].astype(str)
     data = constructors_df.head(top_n).copy()
-    data["label"] = data["constructorName"].apply(lambda s: shorten(str(s), width=28, placeholder="…"))
-    h = _auto_height(len(data))
-    fig, ax = plt.subplots(figsize=(10, h))
-    ax.barh(data["label"], data["points"])
-    ax.invert_yaxis()
-    ax.set_xlabel("Points")
-    ax.set_title("Top Constructors by Points")
-    for i, v in enumerate(data["points"]):
-        ax.text(v, i, f" {int(v)}", va='center', fontsize=8)
-    fig.tight_layout()
-    return fig
+    data["label"] = _short_labels(data["constructorName"])
+    return _render_barh(tuple(data["label"]), tuple(data["points"].tolist()), "Top Constructors by Points")
 
 def plot_championship_pie(counts_df: pd.DataFrame, top_n: int = 10):
     data = counts_df.copy()
@@ -49,9 +56,13 @@ def plot_championship_pie(counts_df: pd.DataFrame, top_n: int = 10):
     data_top = data.head(top_n)
     labels = data_top["driverName"].astype(str)
     sizes = data_top["championships"].astype(int)
+    return _render_pie(tuple(labels), tuple(sizes.tolist()), "Championship Shares (Top {})".format(top_n))
+
+@_cache_figure
+def _render_pie(labels: tuple, sizes: tuple, title: str):
     fig, ax = plt.subplots(figsize=(6,6))
     ax.pie(sizes, labels=labels, autopct='%1.0f%%', startangle=140)
-    ax.set_title("Championship Shares (Top {})".format(top_n))
+    ax.set_title(title)
     fig.tight_layout()
     return fig
 
@@ -61,17 +72,17 @@ def plot_driver_season_progress(driver_results_df: pd.DataFrame):
         ax.text(0.5,0.5,"No data", ha='center', va='center')
         ax.axis('off')
         return fig
-    df = driver_results_df.copy()
     # ensure ordering by raceId (or round)
-    if "round" in df.columns:
-        df = df.sort_values("round")
-        x = df["round"].astype(str)
-    else:
-        df = df.sort_values("raceId")
-        x = df["raceId"].astype(str)
-    df["cumulative"] = df["points"].cumsum()
+    x_col = "round" if "round" in driver_results_df.columns else "raceId"
+    x = driver_results_df[x_col].to_numpy()
+    order = np.argsort(x, kind="stable")
+    cumulative = driver_results_df["points"].to_numpy(dtype="float64", na_value=0.0)[order].cumsum()
+    return _render_progress(tuple(x[order].astype(str)), tuple(cumulative.tolist()))
+
+@_cache_figure
+def _render_progress(x: tuple, cumulative: tuple):
     fig, ax = plt.subplots(figsize=(10,4))
-    ax.plot(x, df["cumulative"], marker='o')
+    ax.plot(x, cumulative, marker='o')
     ax.set_xlabel("Race")
     ax.set_ylabel("Cumulative Points")
     ax.set_title("Season Progress (Cumulative Points)")
@@ -79,6 +90,16 @@ def plot_driver_season_progress(driver_results_df: pd.DataFrame):
     fig.tight_layout()
     return fig
 
+def show_points_chart(points_df: pd.DataFrame, name_col: str, top_n: int = 15, title: str = ""):
+    # Vega-Lite chart rendered in the browser; sort="-x" keeps the points ranking
+    data = points_df.head(top_n)[[name_col, "points"]].astype({name_col: str})
+    chart = alt.Chart(data, title=title).mark_bar().encode(
+        x=alt.X("points:Q", title="Points"),
+        y=alt.Y(f"{name_col}:N", sort="-x", title=None),
+        tooltip=[name_col, "points"],
+    )
+    st.altair_chart(chart, use_container_width=True)
+
 def show_results_table(df: pd.DataFrame):
     if df is None or df.empty:
         st.write("No results to show.")
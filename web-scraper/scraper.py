@@ -6,27 +6,65 @@ Features:
 - Paginated scraping (follows "Next" links)
 - CSV export
 - Polite scraping with delay and custom User-Agent
-- Basic retries for HTTP errors
+- Retries with backoff for connection errors and 429/5xx responses
+- Optional concurrent fetching with aiohttp (--concurrency N)
+- Conditional GETs (ETag / Last-Modified) cached in the SQLite DB when --sqlite is set
 Usage bash code example:
     python scraper.py --csv data.csv --limit-pages 3 --delay 1.0
+    python scraper.py --csv data.csv --concurrency 4
 """
 from __future__ import annotations
 import argparse
+import asyncio
 import csv
+import importlib.util
 import logging
+import os
 import random
+import re
 import sqlite3
 import sys
 import time
-from typing import Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp  # optional: only needed for --concurrency > 1
+except ImportError:
+    aiohttp = None
+
+# requests (via urllib3) and aiohttp decode "br" only when a Brotli binding is installed
+_HAS_BROTLI = any(importlib.util.find_spec(m) is not None for m in ("brotli", "brotlicffi"))
+ACCEPT_ENCODING = "br, gzip, deflate" if _HAS_BROTLI else "gzip, deflate"
 
 BASE_URL = "https://quotes.toscrape.com"
 DEFAULT_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
 TIMEOUT = 15
+BATCH_SIZE = 1000  # rows buffered before each CSV/SQLite write
+FIELDNAMES = ("quote", "author", "tags")
+Row = Tuple[str, str, str]  # (quote, author, tags), same order as FIELDNAMES
+
+# built once at import; HTTP/1.1 keeps connections alive without a Connection header,
+# and Accept-Language is only sent when asked for (--accept-language)
+DEFAULT_HEADERS = MappingProxyType({
+    "User-Agent": DEFAULT_USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": ACCEPT_ENCODING,
+})
+
+_PAGE_HREF = re.compile(r"/page/(\d+)/")
+
+logger = logging.getLogger(__name__)
+
+def page_url(n: int) -> str:
+    return f"{BASE_URL}/page/{n}/"
 
 def setup_logging(verbose: bool) -> None:
     level = logging.DEBUG if verbose else logging.INFO
@@ -36,71 +74,147 @@ def setup_logging(verbose: bool) -> None:
         datefmt="%H:%M:%S",
     )
 
-def get_session(user_agent: Optional[str] = None) -> requests.Session:
+def default_headers(user_agent: Optional[str] = None, accept_language: Optional[str] = None) -> Dict[str, str]:
+    headers = dict(DEFAULT_HEADERS)
+    if user_agent:
+        headers["User-Agent"] = user_agent
+    if accept_language:
+        headers["Accept-Language"] = accept_language
+    return headers
+
+def get_session(
+    user_agent: Optional[str] = None,
+    retries: int = 3,
+    backoff: float = 1.5,
+    *,
+    accept_language: Optional[str] = None,
+) -> requests.Session:
     s = requests.Session()
-    s.headers.update({
-        "User-Agent": user_agent or DEFAULT_USER_AGENT,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Cache-Control": "no-cache",
-    })
+    # replace requests' defaults rather than merging, so only DEFAULT_HEADERS go on the wire
+    s.headers.clear()
+    s.headers.update(default_headers(user_agent, accept_language))
+    # retries with backoff happen inside urllib3's connection pool, reusing the kept-alive connection
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
     return s
 
-def fetch_html(session: requests.Session, url: str, retries: int = 3, backoff: float = 1.5) -> str:
+def _conditional_headers(cache: Optional[sqlite3.Connection], url: str) -> Tuple[Dict[str, str], Optional[str]]:
+    """Return If-None-Match/If-Modified-Since headers and the cached body stored for url."""
+    if cache is None:
+        return {}, None
+    row = cache.execute("SELECT etag, last_modified, body FROM http_cache WHERE url = ?", (url,)).fetchone()
+    if row is None:
+        return {}, None
+    etag, last_modified, body = row
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers, body
+
+def _store_response(cache: Optional[sqlite3.Connection], url: str, etag: Optional[str], last_modified: Optional[str], body: str) -> None:
+    if cache is None or not (etag or last_modified):
+        return
+    cache.execute(
+        "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body) VALUES (?, ?, ?, ?)",
+        (url, etag, last_modified, body),
+    )
+
+def fetch_html(session: requests.Session, url: str, cache: Optional[sqlite3.Connection] = None) -> str:
+    logger.debug("GET %s", url)
+    headers, cached_body = _conditional_headers(cache, url)
+    resp = session.get(url, headers=headers, timeout=TIMEOUT)
+    if resp.status_code == 304 and cached_body is not None:
+        logger.debug("Not modified: %s", url)
+        return cached_body
+    resp.raise_for_status()
+    _store_response(cache, url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), resp.text)
+    return resp.text
+
+async def fetch_html_async(
+    session: "aiohttp.ClientSession",
+    url: str,
+    cache: Optional[sqlite3.Connection] = None,
+    retries: int = 3,
+    backoff: float = 1.5,
+) -> str:
     last_exc = None
+    headers, cached_body = _conditional_headers(cache, url)
     for attempt in range(1, retries + 1):
         try:
-            logging.debug(f"GET {url} (attempt {attempt}/{retries})")
-            resp = session.get(url, timeout=TIMEOUT)
-            resp.raise_for_status()
-            return resp.text
+            logger.debug("GET %s (attempt %d/%d)", url, attempt, retries)
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=TIMEOUT)) as resp:
+                if resp.status == 304 and cached_body is not None:
+                    logger.debug("Not modified: %s", url)
+                    return cached_body
+                if resp.status == 404:
+                    # speculative fetch past the last page
+                    return ""
+                resp.raise_for_status()
+                body = await resp.text()
+                _store_response(cache, url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), body)
+                return body
         except Exception as e:
             last_exc = e
             wait = backoff ** attempt + random.uniform(0, 0.2)
-            logging.warning(f"Request failed: {e!r}. Retrying in {wait:.2f}s")
-            time.sleep(wait)
+            logger.warning("Request failed: %r. Retrying in %.2fs", e, wait)
+            await asyncio.sleep(wait)
     raise RuntimeError(f"Failed to fetch {url} after {retries} retries") from last_exc
 
-def parse_quotes(html: str) -> Tuple[List[Dict], Optional[str]]:
-    soup = BeautifulSoup(html, "lxml")
+def _text(node: Any) -> str:
+    # css_first returns None for a missing element
+    return node.text(strip=True) if node is not None else ""
+
+def parse_quotes(html: str) -> Tuple[List[Row], Optional[str]]:
+    if not html.strip():
+        return [], None
+    tree = LexborHTMLParser(html)
     items = []
-    for q in soup.select("div.quote"):
-        text = q.select_one("span.text")
-        author = q.select_one("small.author")
-        tag_nodes = q.select("div.tags a.tag")
-        items.append({
-            "quote": (text.get_text(strip=True) if text else ""),
-            "author": (author.get_text(strip=True) if author else ""),
-            "tags": ", ".join(t.get_text(strip=True) for t in tag_nodes) if tag_nodes else "",
-        })
-    # next page
-    next_link = soup.select_one("li.next a")
-    next_href = next_link.get("href") if next_link else None
+    next_href = None
+    # one selector pass picks up both the quotes and the "Next" link, in document order
+    for node in tree.css("div.quote, li.next a"):
+        if node.tag == "div":
+            items.append((
+                _text(node.css_first("span.text")),
+                _text(node.css_first("small.author")),
+                ", ".join([t.text(strip=True) for t in node.css("div.tags a.tag")]),
+            ))
+        elif next_href is None:
+            next_href = node.attributes.get("href")
     return items, next_href
 
-def save_to_csv(rows: Iterable[Dict], csv_path: str) -> None:
-    rows = list(rows)
+def save_to_csv(rows: List[Row], writer: Any, write_header: bool = False) -> None:
     if not rows:
-        logging.info("No data to write to CSV.")
+        logger.info("No data to write to CSV.")
         return
-    fieldnames = list(rows[0].keys())
-    write_header = not _file_exists(csv_path)
-    with open(csv_path, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        if write_header:
-            writer.writeheader()
-        writer.writerows(rows)
-    logging.info(f"Wrote {len(rows)} rows to {csv_path}")
-
-def _file_exists(path: str) -> bool:
-    try:
-        import os
-        return os.path.exists(path) and os.path.getsize(path) > 0
-    except Exception:
-        return False
+    if write_header:
+        writer.writerow(FIELDNAMES)
+    writer.writerows(rows)
+    logger.info("Wrote %d rows to CSV", len(rows))
+
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # persists in the DB file
+    "PRAGMA synchronous=NORMAL",  # per connection: fsync at WAL checkpoints, not every commit
+    "PRAGMA cache_size=-100000",  # ~100 MB page cache
+    "PRAGMA temp_store=MEMORY",
+)
+
+def connect_sqlite(db_path: str) -> sqlite3.Connection:
+    # autocommit mode; save_to_sqlite opens an explicit transaction per batch
+    con = sqlite3.connect(db_path, isolation_level=None)
+    for pragma in _SQLITE_PRAGMAS:
+        con.execute(pragma)
+    return con
 
-def init_sqlite(db_path: str) -> None:
-    con = sqlite3.connect(db_path)
+def init_sqlite(con: sqlite3.Connection) -> None:
     cur = con.cursor()
     cur.execute(
         """
@@ -112,23 +226,98 @@ def init_sqlite(db_path: str) -> None:
         );
         """
     )
-    con.commit()
-    con.close()
+    # validators + last body per URL for conditional GETs on re-runs
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS http_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            body TEXT
+        );
+        """
+    )
 
-def save_to_sqlite(rows: Iterable[Dict], db_path: str) -> None:
-    rows = list(rows)
+def save_to_sqlite(rows: List[Row], con: sqlite3.Connection) -> None:
     if not rows:
-        logging.info("No data to write to SQLite.")
+        logger.info("No data to write to SQLite.")
         return
-    con = sqlite3.connect(db_path)
     cur = con.cursor()
-    cur.executemany(
-        "INSERT INTO quotes (quote, author, tags) VALUES (?, ?, ?)",
-        [(r["quote"], r["author"], r["tags"]) for r in rows],
-    )
-    con.commit()
-    con.close()
-    logging.info(f"Inserted {len(rows)} rows into {db_path}")
+    cur.execute("BEGIN")
+    try:
+        cur.executemany(
+            "INSERT INTO quotes (quote, author, tags) VALUES (?, ?, ?)",
+            rows,
+        )
+        inserted = cur.rowcount
+    except Exception:
+        cur.execute("ROLLBACK")
+        raise
+    cur.execute("COMMIT")
+    logger.info("Inserted %d rows into SQLite", inserted)
+
+class BatchWriter:
+    """
+    Keeps the CSV file and SQLite connection open for the whole crawl and
+    writes buffered rows every `batch_size` rows (and on exit), so a crawl
+    pays one file open and one commit per batch instead of per page.
+    """
+
+    def __init__(self, csv_path: Optional[str], sqlite_path: Optional[str], batch_size: int = BATCH_SIZE):
+        self.csv_path = csv_path
+        self.sqlite_path = sqlite_path
+        self.batch_size = batch_size
+        self.buffer: List[Row] = []
+        self._csv_file = None
+        self._csv_writer = None
+        self._write_header = False
+        self.con = None
+
+    def __enter__(self) -> "BatchWriter":
+        if self.csv_path:
+            self._csv_file = open(self.csv_path, "a", newline="", encoding="utf-8")
+            self._csv_writer = csv.writer(self._csv_file)
+            # append mode starts at end of file, so position 0 means a new/empty file
+            self._write_header = self._csv_file.tell() == 0
+        if self.sqlite_path:
+            # one connection (and one round of PRAGMAs) for schema setup, cache lookups and inserts
+            self.con = connect_sqlite(self.sqlite_path)
+            try:
+                init_sqlite(self.con)
+            except Exception:
+                self.__exit__(None, None, None)
+                raise
+        return self
+
+    def add(self, items: List[Row]) -> None:
+        self.buffer.extend(items)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.buffer:
+            return
+        # swap the buffer out first so a failed write is never retried (and duplicated in the CSV)
+        rows, self.buffer = self.buffer, []
+        if self._csv_writer is not None:
+            save_to_csv(rows, self._csv_writer, self._write_header)
+            self._write_header = False
+        if self.con is not None:
+            save_to_sqlite(rows, self.con)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self.flush()
+        except Exception:
+            # don't let a failed final write mask the exception that ended the crawl
+            if exc_type is None:
+                raise
+            logger.exception("Could not write buffered rows")
+        finally:
+            if self._csv_file is not None:
+                self._csv_file.close()
+            if self.con is not None:
+                self.con.close()
 
 def scrape(
     limit_pages: Optional[int],
@@ -137,40 +326,105 @@ def scrape(
     csv_path: Optional[str],
     sqlite_path: Optional[str],
     verbose: bool,
+    *,
+    accept_language: Optional[str] = None,
 ) -> None:
     setup_logging(verbose)
-    session = get_session(user_agent)
+    session = get_session(user_agent, accept_language=accept_language)
     url = BASE_URL
     page = 0
+    paged = False
+    jitter_scale = delay * 0.15 if delay > 0.0 else 0.0
 
-    if sqlite_path:
-        init_sqlite(sqlite_path)
+    with BatchWriter(csv_path, sqlite_path) as out:
+        while True:
+            page += 1
+            logger.info("Scraping page %d: %s", page, url)
+            html = fetch_html(session, url, out.con)
+            items, next_href = parse_quotes(html)
+            if not items:
+                logger.info("No quotes on page %d. Finished.", page)
+                break
+            out.add(items)
 
-    while True:
-        page += 1
-        logging.info(f"Scraping page {page}: {url}")
-        html = fetch_html(session, url)
-        items, next_href = parse_quotes(html)
+            if limit_pages and page >= limit_pages:
+                logger.info("Reached page limit. Stopping.")
+                break
+            if not next_href:
+                logger.info("No next page link. Finished.")
+                break
 
-        if csv_path:
-            save_to_csv(items, csv_path)
-        if sqlite_path:
-            save_to_sqlite(items, sqlite_path)
+            # polite delay (skipped entirely for --delay 0)
+            if delay > 0.0:
+                sleep_for = delay + random.random() * jitter_scale
+                logger.debug("Sleeping for %.2fs", sleep_for)
+                time.sleep(sleep_for)
 
-        if limit_pages and page >= limit_pages:
-            logging.info("Reached page limit. Stopping.")
-            break
-        if not next_href:
-            logging.info("No next page link. Finished.")
-            break
+            # once the site shows /page/N/ links, build URLs from the counter instead of urljoin
+            paged = paged or bool(_PAGE_HREF.search(next_href))
+            url = page_url(page + 1) if paged else urljoin(url, next_href)
 
-        # polite delay
-        sleep_for = max(0.0, delay + random.uniform(0, delay * 0.15 if delay else 0.0))
-        if sleep_for:
-            logging.debug(f"Sleeping for {sleep_for:.2f}s")
-            time.sleep(sleep_for)
+async def scrape_async(
+    limit_pages: Optional[int],
+    delay: float,
+    user_agent: Optional[str],
+    csv_path: Optional[str],
+    sqlite_path: Optional[str],
+    concurrency: int,
+    *,
+    accept_language: Optional[str] = None,
+) -> None:
+    """
+    Fetch pages /page/1/, /page/2/, ... in batches of `concurrency` requests over
+    one keep-alive connection pool. Pages are requested speculatively, so the
+    crawl stops at the first page without quotes or without a "Next" link.
+    Each batch is parsed in parallel in a process pool; writes stay in page order.
+    """
+    if aiohttp is None:
+        raise RuntimeError("aiohttp is required for --concurrency > 1 (pip install aiohttp)")
+    loop = asyncio.get_running_loop()
+    connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30)
+    page = 1
+    jitter_scale = delay * 0.15 if delay > 0.0 else 0.0
+    workers = min(concurrency, os.cpu_count() or 1)
 
-        url = urljoin(url, next_href)
+    # parse_quotes is a module-level function, so worker processes can unpickle it
+    with BatchWriter(csv_path, sqlite_path) as out, ProcessPoolExecutor(max_workers=workers) as pool:
+        async with aiohttp.ClientSession(connector=connector, headers=default_headers(user_agent, accept_language)) as session:
+            while True:
+                last = page + concurrency - 1
+                if limit_pages:
+                    last = min(last, limit_pages)
+                urls = [page_url(n) for n in range(page, last + 1)]
+                logger.info("Scraping pages %d-%d", page, last)
+                htmls = await asyncio.gather(*(fetch_html_async(session, u, out.con) for u in urls))
+                parsed = await asyncio.gather(*(loop.run_in_executor(pool, parse_quotes, h) for h in htmls))
+
+                finished = False
+                for n, (items, next_href) in zip(range(page, last + 1), parsed):
+                    if not items:
+                        logger.info("No quotes on page %d. Finished.", n)
+                        finished = True
+                        break
+                    out.add(items)
+                    if not next_href:
+                        logger.info("No next page link. Finished.")
+                        finished = True
+                        break
+
+                if finished:
+                    break
+                if limit_pages and last >= limit_pages:
+                    logger.info("Reached page limit. Stopping.")
+                    break
+
+                # polite delay between batches; asyncio.sleep keeps the event loop free
+                if delay > 0.0:
+                    sleep_for = delay + random.random() * jitter_scale
+                    logger.debug("Sleeping for %.2fs", sleep_for)
+                    await asyncio.sleep(sleep_for)
+
+                page = last + 1
 
 def build_arg_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Simple web scraper (quotes.toscrape.com)")
@@ -179,6 +433,8 @@ def build_arg_parser() -> argparse.ArgumentParser:
     p.add_argument("--limit-pages", type=int, default=0, help="Stop after N pages (0 = no limit).")
     p.add_argument("--delay", type=float, default=1.0, help="Polite delay between page requests in seconds (default: 1.0)")
     p.add_argument("--user-agent", default="", help="Custom User-Agent string")
+    p.add_argument("--accept-language", default="", help="Accept-Language header value, e.g. 'en-US,en;q=0.5' (not sent by default)")
+    p.add_argument("--concurrency", type=int, default=1, help="Pages fetched concurrently with aiohttp (default: 1 = sequential)")
     p.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
     return p
 
@@ -188,20 +444,33 @@ def main(argv: Optional[List[str]] = None) -> int:
     sqlite_path = args.sqlite_path.strip() or None
     limit_pages = args.limit_pages if args.limit_pages > 0 else None
     try:
-        scrape(
-            limit_pages=limit_pages,
-            delay=args.delay,
-            user_agent=(args.user_agent or None),
-            csv_path=csv_path,
-            sqlite_path=sqlite_path,
-            verbose=args.verbose,
-        )
+        if args.concurrency > 1:
+            setup_logging(args.verbose)
+            asyncio.run(scrape_async(
+                limit_pages=limit_pages,
+                delay=args.delay,
+                user_agent=(args.user_agent or None),
+                accept_language=(args.accept_language or None),
+                csv_path=csv_path,
+                sqlite_path=sqlite_path,
+                concurrency=args.concurrency,
+            ))
+        else:
+            scrape(
+                limit_pages=limit_pages,
+                delay=args.delay,
+                user_agent=(args.user_agent or None),
+                accept_language=(args.accept_language or None),
+                csv_path=csv_path,
+                sqlite_path=sqlite_path,
+                verbose=args.verbose,
+            )
         return 0
     except KeyboardInterrupt:
-        logging.warning("Interrupted by user.")
+        logger.warning("Interrupted by user.")
         return 2
     except Exception as e:
-        logging.exception("Scraper failed")
+        logger.exception("Scraper failed")
         return 1
 
 if __name__ == "__main__":